@@ -5,6 +5,7 @@ Interactive command-line interface for testing and using the product normalizati
 
 import argparse
 import json
+import logging
 import sys
 from pathlib import Path
 from typing import List, Dict
@@ -328,6 +329,7 @@ Examples:
     subparsers.add_parser("interactive", help="Enter interactive mode")
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
     
     # Initialize CLI
     cli = NormalizerCLI()
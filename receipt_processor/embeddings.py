@@ -8,15 +8,19 @@ This module provides:
 3. Cosine similarity for semantic matching
 """
 
+import functools
+import hashlib
+import heapq
 import json
 import logging
 import math
+import os
+import tempfile
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from collections import Counter
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Try to import sentence transformers (optional, better quality)
@@ -36,6 +40,43 @@ except ImportError:
         NUMPY_AVAILABLE = False
     logger.info("sentence-transformers not available. Using TF-IDF embeddings instead.")
 
+# Optional hnswlib for approximate nearest-neighbour search on large indexes
+try:
+    import hnswlib  # type: ignore
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+# Rows of the int8 index upcast to float32 at a time while scoring
+INDEX_BLOCK_ROWS = 4096
+
+# Transformer indexes larger than this use HNSW (when installed) instead of a full scan
+HNSW_MIN_INDEX_SIZE = 10_000
+
+# Cached index embeddings kept per cache dir, most recently used first. More
+# than one, so processes sharing a data dir with different indexes keep theirs.
+INDEX_CACHE_KEEP = 4
+# Caches used more recently than this are never pruned, whatever their rank, so
+# a set another process has just written or loaded is not deleted under it
+INDEX_CACHE_GRACE_SECONDS = 3600
+
+
+def quantize_rows(matrix):
+    """
+    Symmetric per-row int8 quantization.
+    
+    Args:
+        matrix: 2-D float array
+        
+    Returns:
+        Tuple of (int8 matrix, float32 per-row scales) such that
+        matrix ~= int8_matrix * scales[:, None]
+    """
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(matrix / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
 
 class TFIDFEmbedder:
     """
@@ -85,7 +126,7 @@ class TFIDFEmbedder:
             else:
                 self.idf[word] = 0.0
         
-        logger.info(f"Fitted TF-IDF on {doc_count} documents with {len(self.vocabulary)} unique words")
+        logger.info("Fitted TF-IDF on %d documents with %d unique words", doc_count, len(self.vocabulary))
     
     def embed(self, text: str) -> List[float]:
         """
@@ -175,8 +216,11 @@ class SentenceTransformerEmbedder:
                 "Install with: pip install sentence-transformers"
             )
         
+        self.model_name = model_name
         self.model = SentenceTransformer(model_name)
-        logger.info(f"SentenceTransformerEmbedder initialized with model: {model_name}")
+        # Receipt queries repeat heavily; cache their embeddings per instance
+        self.embed = functools.lru_cache(maxsize=1024)(self.embed)
+        logger.info("SentenceTransformerEmbedder initialized with model: %s", model_name)
     
     def embed(self, text: str):
         """
@@ -265,6 +309,10 @@ class SemanticMatcher:
         """
         self.embedder = None
         self.embedder_type = None
+        self.index_texts: List[str] = []
+        self._index_matrix = None  # one unit-length embedding row per index text
+        self._index_scales = None  # per-row scales when _index_matrix is int8
+        self._hnsw = None  # approximate index for very large catalogs
         
         if use_transformers and SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
@@ -272,7 +320,7 @@ class SemanticMatcher:
                 self.embedder_type = 'transformer'
                 logger.info("Using SentenceTransformer embeddings")
             except Exception as e:
-                logger.warning(f"Failed to load SentenceTransformer: {e}")
+                logger.warning("Failed to load SentenceTransformer: %s", e)
                 use_transformers = False
         
         if not use_transformers or self.embedder is None:
@@ -355,6 +403,333 @@ class SemanticMatcher:
         
         results.sort(key=lambda x: x[1], reverse=True)
         return results[:top_k]
+    
+    def build_index(self, texts: List[str], cache_dir: Optional[Path] = None) -> None:
+        """
+        Embed a fixed set of texts once so queries can be scored against
+        all of them with a single matrix-vector product.
+        
+        Args:
+            texts: Texts to index (e.g. all product names and aliases)
+            cache_dir: Optional directory for persisting the index
+                      embeddings between runs (memory-mapped on load)
+        """
+        self.index_texts = list(texts)
+        
+        if self.embedder_type == 'transformer':
+            # The int8 rows and their scales are what gets cached, so a warm
+            # start maps the quantized index (4x smaller than float32) directly
+            self._index_matrix, self._index_scales = self._cached_index_arrays(
+                cache_dir, ("", "_scales"),
+                lambda: quantize_rows(self._embed_index_transformer(self.index_texts))
+            )
+            
+            self._hnsw = None
+            if HNSWLIB_AVAILABLE and len(self.index_texts) > HNSW_MIN_INDEX_SIZE:
+                matrix = self._index_matrix.astype(np.float32) * self._index_scales[:, None]
+                self._hnsw = hnswlib.Index(space='cosine', dim=matrix.shape[1])
+                self._hnsw.init_index(max_elements=len(self.index_texts), ef_construction=200, M=16)
+                self._hnsw.add_items(matrix, np.arange(len(self.index_texts)))
+                self._hnsw.set_ef(64)
+                logger.info("Using HNSW index for semantic search")
+        elif NUMPY_AVAILABLE:
+            self._index_matrix, = self._cached_index_arrays(
+                cache_dir, ("",), lambda: (self._embed_index_tfidf(self.index_texts),)
+            )
+        else:
+            self._index_matrix = self._embed_index_sparse(self.index_texts)
+        
+        logger.info("Built semantic index with %d texts", len(self.index_texts))
+    
+    def extend_index(self, texts: List[str]) -> None:
+        """
+        Append texts to an index built with build_index, embedding only
+        the new rows.
+        
+        Args:
+            texts: Texts to add after the existing index rows
+        """
+        texts = list(texts)
+        if self._index_matrix is None or not texts:
+            return
+        start = len(self.index_texts)
+        self.index_texts.extend(texts)
+        
+        if self.embedder_type == 'transformer':
+            matrix = self._embed_index_transformer(texts)
+            rows, scales = quantize_rows(matrix)
+            self._index_matrix = np.concatenate([self._index_matrix, rows])
+            self._index_scales = np.concatenate([self._index_scales, scales])
+            if self._hnsw is not None:
+                self._hnsw.resize_index(len(self.index_texts))
+                self._hnsw.add_items(matrix, np.arange(start, len(self.index_texts)))
+        elif NUMPY_AVAILABLE:
+            self._index_matrix = np.concatenate([self._index_matrix, self._embed_index_tfidf(texts)])
+        else:
+            self._index_matrix.extend(self._embed_index_sparse(texts))
+    
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """
+        Find the index texts most similar to a query.
+        
+        Args:
+            query: Search query
+            top_k: Number of results to return
+            
+        Returns:
+            List of (row, score) tuples, best first; rows index into
+            index_texts. Ties are returned in row order.
+        """
+        return self.search_batch([query], top_k)[0]
+    
+    def search_batch(self, queries: List[str], top_k: int = 5,
+                     exclude_rows: Optional[Iterable[int]] = None) -> List[List[Tuple[int, float]]]:
+        """
+        Find the index texts most similar to each of several queries.
+        
+        All queries are embedded together and scored with one
+        matrix-matrix product (or one batched HNSW query).
+        
+        Args:
+            queries: Search queries
+            top_k: Number of results per query
+            exclude_rows: Index rows never to return (they do not count
+                          towards top_k)
+            
+        Returns:
+            One list of (row, score) tuples per query, as returned by search()
+        """
+        excluded = set(exclude_rows or ())
+        top_k = min(top_k, len(self.index_texts) - len(excluded))
+        if top_k <= 0 or not queries:
+            return [[] for _ in queries]
+        
+        if self._hnsw is not None:
+            # Fetch enough neighbours that top_k remain after dropping excluded rows
+            k = min(top_k + len(excluded), len(self.index_texts))
+            self._hnsw.set_ef(max(64, k))
+            vectors = np.asarray(self.embedder.embed_batch(list(queries)), dtype=np.float32)
+            labels, distances = self._hnsw.knn_query(vectors, k=k)
+            return [
+                [
+                    (int(row), max(0.0, min(1.0, 1.0 - float(distance))))
+                    for row, distance in zip(rows, dists) if int(row) not in excluded
+                ][:top_k]
+                for rows, dists in zip(labels, distances)
+            ]
+        
+        all_scores = self.index_scores_batch(queries)
+        if excluded:
+            # Below every real score, and top_k leaves them out
+            if NUMPY_AVAILABLE:
+                all_scores[:, sorted(excluded)] = -1.0
+            else:
+                for scores in all_scores:
+                    for row in excluded:
+                        scores[row] = -1.0
+        return [self._top_rows(scores, top_k) for scores in all_scores]
+    
+    @staticmethod
+    def _top_rows(scores, top_k: int) -> List[Tuple[int, float]]:
+        """Best top_k (row, score) pairs of one score row, ties in row order"""
+        if NUMPY_AVAILABLE:
+            # O(n) partition to the k-th best score, then sort only the survivors
+            cutoff = -np.partition(-scores, top_k - 1)[top_k - 1]
+            rows = np.flatnonzero(scores >= cutoff)
+            rows = rows[np.argsort(-scores[rows], kind='stable')][:top_k]
+            return [(int(row), float(scores[row])) for row in rows]
+        
+        rows = heapq.nsmallest(top_k, range(len(scores)), key=lambda row: (-scores[row], row))
+        return [(row, scores[row]) for row in rows]
+    
+    def _embed_index_transformer(self, texts: List[str]):
+        """Unit-length transformer embeddings of texts (float32)"""
+        matrix = np.asarray(self.embedder.embed_batch(texts), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(matrix / norms)
+    
+    def _embed_index_tfidf(self, texts: List[str]):
+        """TF-IDF vectors of texts (already unit length)"""
+        rows = [self.embedder.embed(text) for text in texts]
+        # Explicit width, so an empty index is a (0, vocabulary) matrix
+        return np.asarray(rows, dtype=np.float64).reshape(len(rows), len(self.embedder.vocabulary))
+    
+    def _embed_index_sparse(self, texts: List[str]) -> List[Dict[int, float]]:
+        """TF-IDF vectors of texts as sparse rows (index -> weight)"""
+        # Sparse rows keep the pure-Python dot products short
+        return [
+            {i: w for i, w in enumerate(self.embedder.embed(text)) if w}
+            for text in texts
+        ]
+    
+    def _cached_index_arrays(self, cache_dir: Optional[Path], suffixes: Tuple[str, ...], build):
+        """
+        Load the index arrays from cache_dir (memory-mapped) or build them.
+        
+        Args:
+            cache_dir: Cache directory, or None to always build
+            suffixes: File name suffix of each array returned by build
+            build: Callable returning a tuple of arrays, one per suffix
+        
+        A freshly built set is saved for the next run. Only the
+        INDEX_CACHE_KEEP most recently used sets are kept. Files are
+        written to a temporary name and renamed into place, so a reader
+        never maps a half-written file; one that cannot be loaded anyway
+        (deleted, truncated) is rebuilt.
+        """
+        cache_paths = [self._index_cache_path(cache_dir, suffix) for suffix in suffixes] if cache_dir else []
+        if cache_paths and all(path.exists() for path in cache_paths):
+            try:
+                # Mark as recently used, so pruning keeps it
+                for path in cache_paths:
+                    os.utime(path)
+                arrays = tuple(np.load(path, mmap_mode='r') for path in cache_paths)
+                if any(len(array) != len(self.index_texts) for array in arrays):
+                    raise ValueError("cached index does not match the index texts")
+                logger.info("Loaded cached embeddings from %s", cache_paths[0])
+                return arrays
+            except (OSError, ValueError) as e:
+                logger.warning("Rebuilding unreadable cached embeddings %s: %s", cache_paths[0], e)
+        
+        arrays = build()
+        if cache_paths:
+            try:
+                cache_paths[0].parent.mkdir(parents=True, exist_ok=True)
+                for path, array in zip(cache_paths, arrays):
+                    self._save_array_atomic(path, array)
+                self._prune_index_cache(cache_paths[0].parent)
+            except OSError as e:
+                logger.warning("Failed to cache embeddings: %s", e)
+        return arrays
+    
+    @staticmethod
+    def _save_array_atomic(path: Path, array) -> None:
+        """np.save to a temporary file next to path, then rename it over path"""
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp_", suffix=".npy")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    
+    @staticmethod
+    def _prune_index_cache(cache_dir: Path) -> None:
+        """
+        Delete index caches beyond the INDEX_CACHE_KEEP most recently used,
+        sparing any used within INDEX_CACHE_GRACE_SECONDS.
+        
+        Other processes may prune the same directory concurrently, so files
+        that disappear meanwhile are skipped. Leftover temporary files from
+        interrupted writes are removed once they are past the grace period.
+        """
+        cutoff = time.time() - INDEX_CACHE_GRACE_SECONDS
+        last_used: Dict[str, float] = {}
+        files = []
+        stale = []
+        for pattern in ("index_embeddings_*.npy", ".tmp_*.npy"):
+            for path in cache_dir.glob(pattern):
+                try:
+                    mtime = path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if path.name.startswith(".tmp_"):
+                    if mtime < cutoff:
+                        stale.append(path)
+                    continue
+                key = path.stem.split("_")[2]  # index_embeddings_<key>[_<suffix>]
+                last_used[key] = max(last_used.get(key, 0.0), mtime)
+                files.append(path)
+        
+        keep = set(heapq.nlargest(INDEX_CACHE_KEEP, last_used, key=last_used.get))
+        keep.update(key for key, mtime in last_used.items() if mtime >= cutoff)
+        stale.extend(path for path in files if path.stem.split("_")[2] not in keep)
+        for path in stale:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                # e.g. still memory-mapped by another process on Windows
+                logger.debug("Could not prune %s: %s", path, e)
+    
+    def _index_cache_path(self, cache_dir: Path, suffix: str = "") -> Path:
+        """Cache file for the current embedder state and index texts (in order)"""
+        digest = hashlib.blake2b(digest_size=8)
+        if self.embedder_type == 'transformer':
+            # Cached as int8 rows plus scales (see quantize_rows)
+            digest.update(b'int8\0' + self.embedder.model_name.encode('utf-8'))
+        else:
+            # TF-IDF vectors depend on the fitted vocabulary and weights
+            digest.update(repr((
+                sorted(self.embedder.vocabulary.items()), sorted(self.embedder.idf.items())
+            )).encode('utf-8'))
+        for text in self.index_texts:
+            digest.update(b'\0' + text.encode('utf-8'))
+        return Path(cache_dir) / f"index_embeddings_{digest.hexdigest()}{suffix}.npy"
+    
+    def index_scores(self, query: str):
+        """
+        Similarity of a query to every text passed to build_index.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Scores (0.0 to 1.0) parallel to index_texts; a numpy array when
+            numpy is available, a list otherwise
+        """
+        return self.index_scores_batch([query])[0]
+    
+    def index_scores_batch(self, queries: List[str]):
+        """
+        Similarity of several queries to every text passed to build_index.
+        
+        Args:
+            queries: Search queries
+            
+        Returns:
+            One row of scores per query (see index_scores); a 2-D numpy
+            array when numpy is available, a list of lists otherwise
+        """
+        if self._index_matrix is None:
+            raise ValueError("build_index() must be called before index_scores()")
+        
+        if self.embedder_type == 'transformer':
+            vectors = np.asarray(self.embedder.embed_batch(list(queries)), dtype=np.float32)
+            vectors = vectors.reshape(len(queries), -1)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            queries_q8, query_scales = quantize_rows(vectors / norms)
+            queries_t = queries_q8.astype(np.float32).T
+            
+            # int8 x int8 products, then rescaled. The matmul runs in float32
+            # because numpy has no BLAS path for integer matrices. Up to 1024
+            # dimensions the sums stay below 2**24, so they are still exact.
+            # Going block by block keeps the float32 copy of the index small.
+            scores = np.empty((len(queries), len(self.index_texts)))
+            for start in range(0, len(self.index_texts), INDEX_BLOCK_ROWS):
+                end = start + INDEX_BLOCK_ROWS
+                dots = (self._index_matrix[start:end].astype(np.float32) @ queries_t).T
+                scores[:, start:end] = dots * self._index_scales[start:end] * query_scales[:, None]
+            return np.clip(scores, 0.0, 1.0, out=scores)
+        
+        vectors = [self.embedder.embed(query) for query in queries]
+        
+        if NUMPY_AVAILABLE:
+            if not self.index_texts:
+                return np.zeros((len(queries), 0))
+            vectors = np.asarray(vectors, dtype=np.float64).reshape(len(queries), -1)
+            return np.clip(vectors @ self._index_matrix.T, 0.0, 1.0)
+        
+        rows = []
+        for vector in vectors:
+            query_weights = [(i, w) for i, w in enumerate(vector) if w]
+            rows.append([
+                max(0.0, min(1.0, sum(row.get(i, 0.0) * w for i, w in query_weights)))
+                for row in self._index_matrix
+            ])
+        return rows
 
 
 # ============================================================================
@@ -385,6 +760,8 @@ def init_semantic_matcher(product_names: List[str], use_transformers: bool = Tru
 # ============================================================================
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     print("=" * 80)
     print("Embeddings Module Test")
     print("=" * 80)
@@ -10,7 +10,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
 from config import SHOP_TEMPLATES_FILE, MIN_ITEMS_THRESHOLD
-from product_normalizer import product_normalizer
+import product_normalizer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -210,7 +210,7 @@ class ReceiptExtractor:
                             total = qty * price
 
                             # Normalize the product name
-                            normalized = product_normalizer.normalize(name)
+                            normalized = product_normalizer.get_product_normalizer().normalize(name)
                             
                             items.append({
                                 "name": name,
@@ -307,7 +307,7 @@ class ReceiptExtractor:
                 price = self._parse_price(item_match.group(3))
 
                 # Normalize the product name
-                normalized = product_normalizer.normalize(name)
+                normalized = product_normalizer.get_product_normalizer().normalize(name)
 
                 items.append({
                     "name": name,
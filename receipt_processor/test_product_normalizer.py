@@ -9,14 +9,62 @@ Tests all phases of the product matching pipeline:
 """
 
 import json
+import os
+import shutil
+import tempfile
+import time
 import unittest
+import zlib
 from pathlib import Path
 from typing import Dict, List
+from unittest import mock
+
+# Keep the caches these tests write out of the user's cache directory
+_test_cache_dir = tempfile.TemporaryDirectory()
+os.environ["GOSHOPPER_CACHE_DIR"] = _test_cache_dir.name
 
 # Import modules to test
-from product_normalizer import ProductNormalizer, product_normalizer
+from product_normalizer import (
+    ProductNormalizer, product_normalizer, get_product_normalizer, _myers_distance, _ResultCache,
+    MASTER_PRODUCTS_FILE, PRODUCT_MAPPINGS_FILE, RESULT_CACHE_FILE,
+)
 from translator import Translator, translator
-from embeddings import SemanticMatcher, TFIDFEmbedder
+import embeddings
+from embeddings import SemanticMatcher, TFIDFEmbedder, INDEX_CACHE_KEEP, INDEX_CACHE_GRACE_SECONDS
+
+
+class StubTransformerEmbedder:
+    """Deterministic stand-in for SentenceTransformerEmbedder (hashed character trigrams)"""
+    
+    model_name = "stub-trigrams"
+    dimensions = 64
+    
+    def embed(self, text: str):
+        vector = embeddings.np.zeros(self.dimensions, dtype=embeddings.np.float32)
+        padded = f"  {text} "
+        for i in range(len(padded) - 2):
+            vector[zlib.crc32(padded[i:i + 3].encode("utf-8")) % self.dimensions] += 1.0
+        return vector
+    
+    def embed_batch(self, texts: List[str]):
+        return embeddings.np.array([self.embed(text) for text in texts]).reshape(len(texts), self.dimensions)
+
+
+def stub_transformer_matcher() -> SemanticMatcher:
+    """SemanticMatcher on the transformer (int8 index) path, with the stub embedder"""
+    matcher = SemanticMatcher(use_transformers=False)
+    matcher.embedder = StubTransformerEmbedder()
+    matcher.embedder_type = "transformer"
+    return matcher
+
+
+def scratch_data_dir(test: unittest.TestCase) -> Path:
+    """Copy of the data files in a temporary directory, for tests that write them"""
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    for name in (MASTER_PRODUCTS_FILE, PRODUCT_MAPPINGS_FILE):
+        shutil.copy(Path(__file__).parent / name, tmp.name)
+    return Path(tmp.name)
 
 
 class TestPhase1CoreDatabase(unittest.TestCase):
@@ -54,6 +102,39 @@ class TestPhase1CoreDatabase(unittest.TestCase):
         self.assertIsNotNone(new_id)
         product = self.normalizer._get_product_by_id(new_id)
         self.assertEqual(product["normalized_name"], "test_product")
+    
+    def test_add_product_matches_rebuilt_index(self):
+        """Test that adding a product indexes it like a full rebuild"""
+        data_dir = scratch_data_dir(self)
+        normalizer = ProductNormalizer(data_dir=data_dir)
+        new_id = normalizer.add_product(
+            normalized_name="manioc frais",
+            category="Test",
+            aliases_fr=["manioc doux"],
+            aliases_en=["fresh cassava"]
+        )
+        self.assertEqual(normalizer.normalize("fresh cassava")["product_id"], new_id)
+        rebuilt = ProductNormalizer(data_dir=data_dir)
+        self.assertEqual(normalizer.product_index, rebuilt.product_index)
+        self.assertEqual(sorted(normalizer._index_keys), sorted(rebuilt._index_keys))
+        # _match, so a result cached on disk by one cannot stand in for the other
+        self.assertEqual(
+            normalizer._match("manioc doux frais"),
+            rebuilt._match("manioc doux frais")
+        )
+    
+    def test_add_products_refit_semantic_index_once(self):
+        """Test that adding several products refits the TF-IDF index once, when first queried"""
+        normalizer = ProductNormalizer(data_dir=scratch_data_dir(self))
+        with mock.patch.object(normalizer, "_init_semantic_matcher",
+                               wraps=normalizer._init_semantic_matcher) as refit:
+            for name in ["manioc frais", "igname blanche", "patate douce orange"]:
+                normalizer.add_product(normalized_name=name, category="Test")
+            self.assertEqual(refit.call_count, 0)
+            normalizer.normalize("xyz unknown product 123")
+            normalizer.normalize("xyz unknown product 456")
+        self.assertEqual(refit.call_count, 1)
+        self.assertEqual(normalizer.semantic_matcher.index_texts, list(normalizer._index_keys))
 
 
 class TestPhase2TextCleaning(unittest.TestCase):
@@ -108,6 +189,11 @@ class TestPhase2TextCleaning(unittest.TestCase):
         score = self.normalizer.levenshtein_similarity("banana", "potato")
         self.assertLess(score, 0.5)
     
+    def test_levenshtein_similarity_indel_ratio(self):
+        """Test that Levenshtein similarity is the Indel ratio 2*LCS/T"""
+        score = self.normalizer.levenshtein_similarity("plantain", "plantan")
+        self.assertAlmostEqual(score, 2 * 7 / 15)
+    
     def test_jaccard_similarity_identical(self):
         """Test Jaccard similarity with identical strings"""
         score = self.normalizer.jaccard_similarity("banana plantain", "banana plantain")
@@ -243,6 +329,171 @@ class TestPhase3Embeddings(unittest.TestCase):
         results = self.matcher.rank_candidates("banane", candidates, top_k=2)
         self.assertEqual(len(results), 2)
         self.assertTrue(all(isinstance(r, tuple) for r in results))
+    
+    def test_index_scores_match_pairwise_similarity(self):
+        """Test that indexed scoring agrees with pairwise similarity"""
+        candidates = ["banana plantain", "potato", "tomato", "onion"]
+        self.matcher.build_index(candidates)
+        scores = self.matcher.index_scores("sweet banana")
+        self.assertEqual(len(scores), len(candidates))
+        for candidate, score in zip(candidates, scores):
+            self.assertAlmostEqual(float(score), self.matcher.similarity("sweet banana", candidate), places=6)
+    
+    def test_search_returns_best_rows_first(self):
+        """Test that top-k search ranks index rows by score"""
+        candidates = ["banana plantain", "potato", "tomato", "onion"]
+        self.matcher.build_index(candidates)
+        hits = self.matcher.search("sweet banana", top_k=2)
+        self.assertEqual(len(hits), 2)
+        self.assertEqual(candidates[hits[0][0]], "banana plantain")
+        self.assertGreaterEqual(hits[0][1], hits[1][1])
+    
+    def test_search_batch_matches_single_search(self):
+        """Test that batched search agrees with one search per query"""
+        candidates = ["banana plantain", "potato", "tomato", "onion"]
+        self.matcher.build_index(candidates)
+        queries = ["sweet banana", "red onion", "unknown"]
+        batched = self.matcher.search_batch(queries, top_k=2)
+        self.assertEqual(len(batched), len(queries))
+        for query, hits in zip(queries, batched):
+            self.assertEqual(
+                [row for row, _ in hits],
+                [row for row, _ in self.matcher.search(query, top_k=2)]
+            )
+    
+    def test_search_excludes_rows(self):
+        """Test that excluded rows are skipped without shrinking top-k"""
+        candidates = ["banana plantain", "banana", "potato", "tomato"]
+        self.matcher.build_index(candidates)
+        full = self.matcher.search("sweet banana", top_k=3)
+        hits = self.matcher.search_batch(["sweet banana"], top_k=2, exclude_rows=[full[0][0]])[0]
+        self.assertEqual(hits, full[1:])
+    
+    def test_empty_index(self):
+        """Test that an empty index can be built and searched"""
+        self.matcher.build_index([])
+        self.assertEqual(self.matcher.search("banana"), [])
+        self.matcher.extend_index(["banana"])
+        self.assertEqual(self.matcher.search("banana")[0][0], 0)
+    
+    def test_index_cache_reused(self):
+        """Test that a cached index scores like a freshly built one"""
+        candidates = ["banana plantain", "potato", "tomato", "onion"]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.matcher.build_index(candidates, cache_dir=Path(cache_dir))
+            built = self.matcher.search("sweet banana", top_k=2)
+            cache_path = self.matcher._index_cache_path(Path(cache_dir))
+            cached = cache_path.exists()  # only with numpy
+            self.matcher.build_index(candidates, cache_dir=Path(cache_dir))
+            self.assertEqual(self.matcher.search("sweet banana", top_k=2), built)
+            
+            # Another index does not evict this one, but old ones are pruned
+            self.matcher.build_index(candidates[:2], cache_dir=Path(cache_dir))
+            self.assertEqual(cache_path.exists(), cached)
+            with mock.patch.object(embeddings, "INDEX_CACHE_GRACE_SECONDS", 0):
+                for size in range(INDEX_CACHE_KEEP + 1):
+                    self.matcher.build_index([f"item {i}" for i in range(size + 1)], cache_dir=Path(cache_dir))
+            self.assertFalse(cache_path.exists())
+            self.assertLessEqual(len(list(Path(cache_dir).glob("*.npy"))), INDEX_CACHE_KEEP)
+    
+    def test_index_cache_grace_period(self):
+        """Test that recently used index caches are not pruned"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.matcher.build_index(["banana", "potato"], cache_dir=Path(cache_dir))
+            cache_path = self.matcher._index_cache_path(Path(cache_dir))
+            cached = cache_path.exists()  # only with numpy
+            for size in range(INDEX_CACHE_KEEP + 1):
+                self.matcher.build_index([f"item {i}" for i in range(size + 1)], cache_dir=Path(cache_dir))
+            self.assertEqual(cache_path.exists(), cached)
+            
+            if cached:
+                old = time.time() - 2 * INDEX_CACHE_GRACE_SECONDS
+                os.utime(cache_path, (old, old))
+            self.matcher.build_index(["onion"], cache_dir=Path(cache_dir))
+            self.assertFalse(cache_path.exists())
+    
+    def test_truncated_index_cache_rebuilt(self):
+        """Test that a truncated index cache file is rebuilt instead of loaded"""
+        candidates = ["banana plantain", "potato", "tomato", "onion"]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.matcher.build_index(candidates, cache_dir=Path(cache_dir))
+            built = self.matcher.search("sweet banana", top_k=2)
+            cache_path = self.matcher._index_cache_path(Path(cache_dir))
+            if cache_path.exists():  # only with numpy
+                size = cache_path.stat().st_size
+                with open(cache_path, "r+b") as f:
+                    f.truncate(size // 2)
+            
+            self.matcher.build_index(candidates, cache_dir=Path(cache_dir))
+            self.assertEqual(self.matcher.search("sweet banana", top_k=2), built)
+            if cache_path.exists():
+                self.assertEqual(cache_path.stat().st_size, size)
+            self.assertEqual(list(Path(cache_dir).glob(".tmp_*")), [])
+
+
+@unittest.skipUnless(embeddings.NUMPY_AVAILABLE, "the transformer index needs numpy")
+class TestTransformerIndex(unittest.TestCase):
+    """Test the int8 transformer index with a stub embedder"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.texts = [f"{word} {i}" for i, word in enumerate(["banana", "potato", "tomato", "onion", "rice"] * 10)]
+        self.queries = ["banana 5", "sweet potato", "rice 49"]
+    
+    def float_scores(self, matcher: SemanticMatcher):
+        """Unquantized cosine scores of the queries against the index texts"""
+        np = embeddings.np
+        index = matcher.embedder.embed_batch(self.texts)
+        index /= np.linalg.norm(index, axis=1, keepdims=True)
+        queries = matcher.embedder.embed_batch(self.queries)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        return np.clip(queries @ index.T, 0.0, 1.0)
+    
+    def test_int8_block_scores(self):
+        """Test that block-wise int8 scores track the float scores"""
+        matcher = stub_transformer_matcher()
+        with mock.patch.object(embeddings, "INDEX_BLOCK_ROWS", 16):
+            matcher.build_index(self.texts)
+            scores = matcher.index_scores_batch(self.queries)
+        self.assertEqual(matcher._index_matrix.dtype, embeddings.np.int8)
+        self.assertLess(float(abs(scores - self.float_scores(matcher)).max()), 0.02)
+        self.assertEqual(matcher.search("banana 5", top_k=1)[0][0], 5)
+    
+    def test_int8_index_cache(self):
+        """Test that the int8 rows and scales are cached and memory-mapped"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            matcher = stub_transformer_matcher()
+            matcher.build_index(self.texts, cache_dir=Path(cache_dir))
+            built = matcher.index_scores_batch(self.queries)
+            for suffix in ("", "_scales"):
+                self.assertTrue(matcher._index_cache_path(Path(cache_dir), suffix).exists())
+            
+            matcher = stub_transformer_matcher()
+            matcher.build_index(self.texts, cache_dir=Path(cache_dir))
+            self.assertIsInstance(matcher._index_matrix, embeddings.np.memmap)
+            self.assertTrue((matcher.index_scores_batch(self.queries) == built).all())
+    
+    @unittest.skipUnless(embeddings.HNSWLIB_AVAILABLE, "needs hnswlib")
+    def test_hnsw_search(self):
+        """Test that large indexes are searched through HNSW"""
+        matcher = stub_transformer_matcher()
+        with mock.patch.object(embeddings, "HNSW_MIN_INDEX_SIZE", 10):
+            matcher.build_index(self.texts)
+        self.assertIsNotNone(matcher._hnsw)
+        self.assertEqual(matcher.search("banana 5", top_k=1)[0][0], 5)
+    
+    def test_normalizer_uses_transformers(self):
+        """Test that use_transformers=True puts the normalizer on the transformer index"""
+        with mock.patch.object(embeddings, "SENTENCE_TRANSFORMERS_AVAILABLE", True), \
+                mock.patch.object(embeddings, "SentenceTransformerEmbedder", StubTransformerEmbedder):
+            normalizer = ProductNormalizer(scratch_data_dir(self), use_transformers=True)
+        self.assertEqual(normalizer.semantic_matcher.embedder_type, "transformer")
+        self.assertEqual(ProductNormalizer(scratch_data_dir(self)).semantic_matcher.embedder_type, "tfidf")
+        for name in ["Banane Plantain", "HLE VGT"]:
+            result = normalizer.normalize(name)
+            self.assertEqual(result["product_id"], product_normalizer.normalize(name)["product_id"])
+        # Reaches the semantic pass, scored on the int8 index
+        self.assertTrue(normalizer.normalize("xyz unknown product 123")["needs_review"])
 
 
 class TestPhase4FinalMatching(unittest.TestCase):
@@ -279,6 +530,158 @@ class TestPhase4FinalMatching(unittest.TestCase):
         if result["product_id"]:
             self.assertGreater(result["confidence"], 0.5)
     
+    def test_fuzzy_lookup_typo(self):
+        """Test edit-distance lookup through the delete index"""
+        matches = self.normalizer.fuzzy_lookup("plantan")
+        self.assertIn(("plantain", 1), matches)
+        self.assertEqual(self.normalizer.fuzzy_lookup("xyzxyzxyz"), [])
+    
+    def test_myers_edit_distance(self):
+        """Test the bit-parallel Levenshtein fallback"""
+        self.assertEqual(_myers_distance("plantain", "plantain"), 0)
+        self.assertEqual(_myers_distance("plantan", "plantain"), 1)
+        self.assertEqual(_myers_distance("kitten", "sitting"), 3)
+        self.assertEqual(_myers_distance("", "riz"), 3)
+        self.assertEqual(_myers_distance("kitten", "sitting", 3), 3)
+        self.assertEqual(_myers_distance("kitten", "sitting", 1), 2)
+        self.assertEqual(_myers_distance("", "riz", 1), 2)
+    
+    def test_normalize_typo_lookup(self):
+        """Test that a close typo resolves without review"""
+        result = self.normalizer.normalize("tomatoe")
+        self.assertEqual(result["product_id"], "PROD_020")
+        self.assertEqual(result["match_method"], "typo")
+        self.assertFalse(result["needs_review"])
+    
+    def test_normalize_results_cached(self):
+        """Test that cached results are private copies invalidated by learning"""
+        normalizer = ProductNormalizer(data_dir=scratch_data_dir(self))
+        first = normalizer.normalize("tomatoe")
+        first["suggestions"].append("mutated")
+        self.assertEqual(normalizer.normalize("tomatoe")["suggestions"], [])
+        
+        for suggestion in normalizer.normalize("banan")["suggestions"]:
+            suggestion["score"] = -1
+        self.assertEqual(normalizer.normalize("banan"), normalizer._match("banan"))
+        
+        self.assertNotEqual(normalizer.normalize("mbika ya kobanga")["match_method"], "exact")
+        normalizer.learn_mapping("mbika ya kobanga", "PROD_001")
+        result = normalizer.normalize("mbika ya kobanga")
+        self.assertEqual(result["match_method"], "exact")
+        self.assertEqual(result["product_id"], "PROD_001")
+    
+    def test_normalize_results_persist_across_restarts(self):
+        """Test that a new normalizer on the same data reuses stored results"""
+        data_dir = scratch_data_dir(self)
+        cache_dir = data_dir / "cache"
+        first = ProductNormalizer(data_dir=data_dir, cache_dir=cache_dir)
+        expected = first.normalize_batch([{"name": "tomatoe"}])[0]["normalization"]
+        self.assertTrue((cache_dir / RESULT_CACHE_FILE).exists())
+        
+        second = ProductNormalizer(data_dir=data_dir, cache_dir=cache_dir)
+        self.assertEqual(second.normalize("tomatoe"), expected)
+        self.assertEqual(second._result_cache.hits, 1)
+    
+    def test_result_cache_keeps_recently_used_rows(self):
+        """Test that stored results outlive catalog changes and go least recently used first"""
+        result = {"product_id": "PROD_001", "normalized_name": "banane_plantain", "confidence": 1.0,
+                  "match_method": "exact", "needs_review": False, "suggestions": []}
+        db_path = scratch_data_dir(self) / RESULT_CACHE_FILE
+        clock = iter(range(1000))
+        with mock.patch("product_normalizer.RESULT_CACHE_DB_ROWS", 10), \
+                mock.patch("product_normalizer.time.time", lambda: next(clock)):
+            cache = _ResultCache(db_path, maxsize=1)
+            cache.reset(b"old catalog")
+            old_key = cache.key("plantain", None)
+            cache.put(old_key, result)
+            cache.reset(b"new catalog")
+            self.assertEqual(_ResultCache(db_path).get(old_key), result)
+            
+            keys = [cache.key(f"line {i}", None) for i in range(20)]
+            for key in keys:
+                cache.put(key, result)
+            cache.flush()
+            reopened = _ResultCache(db_path)
+            self.assertIsNone(reopened.get(old_key))
+            self.assertEqual(reopened.get(keys[-1]), result)
+            self.assertLessEqual(reopened._db_rows, 10)
+    
+    def test_normalize_cache_follows_added_translations(self):
+        """Test that adding a translation invalidates cached results"""
+        tables = (translator.fr_to_en, translator.en_to_fr)
+        saved = [dict(table) for table in tables]
+        def restore():
+            for table, contents in zip(tables, saved):
+                table.clear()
+                table.update(contents)
+        self.addCleanup(restore)
+        
+        normalizer = ProductNormalizer(data_dir=scratch_data_dir(self))
+        self.assertNotEqual(normalizer.normalize("zorblat")["match_method"], "translation")
+        translator.add_translation("zorblat", "banana")
+        result = normalizer.normalize("zorblat")
+        self.assertEqual(result["match_method"], "translation")
+        self.assertEqual(result, normalizer._match("zorblat"))
+    
+    def test_normalize_cache_ignores_case_and_padding(self):
+        """Test that case and surrounding spaces do not change cached results"""
+        for raw in ["  PLANTAN ", "Huile Vegetale", "TOMATOE"]:
+            self.normalizer.clear_result_cache()
+            uncached = self.normalizer.normalize(raw)
+            self.assertEqual(self.normalizer.normalize(raw.strip().lower()), uncached)
+            self.assertEqual(self.normalizer._match(raw.strip().lower()), uncached)
+    
+    def test_skeleton_abbreviation(self):
+        """Test vowel-less abbreviations of catalog names"""
+        result = self.normalizer.normalize("PLNTN")
+        self.assertEqual(result["product_id"], "PROD_001")
+        self.assertEqual(result["match_method"], "abbreviation")
+        self.assertEqual(self.normalizer.skeleton_lookup("tmt")[1], "PROD_020")
+        self.assertIsNone(self.normalizer.skeleton_lookup("tomate"))
+        self.assertIsNone(self.normalizer.skeleton_lookup("xyz"))
+    
+    def test_partial_alias_matches(self):
+        """Test whole-word prefix and contained alias lookups"""
+        prefix = self.normalizer.longest_prefix_match("poulet entier")
+        self.assertEqual(prefix, ("poulet", "PROD_040", 0.5))
+        contained = self.normalizer.find_contained_alias("sac riz 25kg")
+        self.assertEqual(contained[:2], ("riz", "PROD_060"))
+        self.assertIsNone(self.normalizer.find_contained_alias("painting"))
+    
+    def test_similarity_scores_keep_best_and_suggestions(self):
+        """Test that bounded scoring agrees with full pairwise scoring"""
+        keys = self.normalizer._index_keys
+        for text in ["tomatoe fresh", "huile palme 1l", "savon omo"]:
+            [scores] = self.normalizer._similarity_scores([text])
+            exact = [self.normalizer.combined_similarity(text, key) for key in keys]
+            best = max(range(len(keys)), key=exact.__getitem__)
+            self.assertEqual(max(range(len(keys)), key=lambda i: scores[i]), best)
+            for i, score in enumerate(exact):
+                if score > 0.5:
+                    self.assertAlmostEqual(float(scores[i]), score, places=6)
+    
+    def test_semantic_suggestions_keep_best_score(self):
+        """Test that each product is suggested once, with its best semantic score"""
+        pids = self.normalizer._index_pids
+        rows = [row for row, pid in enumerate(pids) if pid == pids[0]]
+        other = next(row for row, pid in enumerate(pids) if pid != pids[0])
+        self.assertGreater(len(rows), 1)
+        hits = {
+            "first": [(rows[0], 0.6), (other, 0.55)],
+            "second": [(rows[1], 0.8), (other, 0.7), (rows[0], 0.4)],
+        }
+        
+        class StubMatcher:
+            def search_batch(self, queries, top_k=5, exclude_rows=None):
+                return [hits[query] for query in queries]
+        
+        self.normalizer.semantic_matcher = StubMatcher()
+        candidates = self.normalizer._semantic_suggestions(["first", "second"], set())
+        self.assertEqual(candidates, [
+            (0.8, pids[0], self.normalizer._index_keys[rows[1]], "semantic"),
+            (0.7, pids[other], self.normalizer._index_keys[other], "semantic"),
+        ])
+    
     def test_normalize_unknown_product(self):
         """Test normalization with unknown product"""
         result = self.normalizer.normalize("xyz unknown product 123")
@@ -320,6 +723,15 @@ class TestPhase4FinalMatching(unittest.TestCase):
             self.assertIn("normalization", result)
             self.assertIn("product_id", result["normalization"])
     
+    def test_normalize_batch_parallel_keeps_order(self):
+        """Test that a large batch matches item-by-item normalization"""
+        names = ["Banana Plantain", "Pomme de terre", "Tomate", "HLE VGT", "plantan", "Unknown XYZ"] * 3
+        results = self.normalizer.normalize_batch([{"name": name} for name in names], shop_id="shop_1")
+        self.assertEqual(
+            [result["normalization"] for result in results],
+            [self.normalizer.normalize(name, "shop_1") for name in names]
+        )
+    
     def test_learn_mapping(self):
         """Test learning a new mapping"""
         success = self.normalizer.learn_mapping(
@@ -334,6 +746,18 @@ class TestPhase4FinalMatching(unittest.TestCase):
         self.assertEqual(result["product_id"], "PROD_001")
         self.assertEqual(result["confidence"], 1.0)
     
+    def test_learned_raw_line_follows_relearned_mapping(self):
+        """Test that a learned raw line resolves to its latest mapping"""
+        normalizer = ProductNormalizer(data_dir=scratch_data_dir(self))
+        normalizer.learn_mapping("BANANE KIN. SPECIALE", "PROD_001")
+        result = normalizer.normalize("BANANE KIN. SPECIALE")
+        self.assertEqual(result["product_id"], "PROD_001")
+        self.assertEqual(result["match_method"], "exact")
+        
+        normalizer.learn_mapping("banane kin speciale", "PROD_002")
+        result = normalizer.normalize("BANANE KIN. SPECIALE")
+        self.assertEqual(result["product_id"], "PROD_002")
+    
     def test_search_products(self):
         """Test product search functionality"""
         results = self.normalizer.search_products("banana", limit=5)
@@ -341,6 +765,18 @@ class TestPhase4FinalMatching(unittest.TestCase):
         self.assertGreater(len(results), 0)
         self.assertTrue(all("match_score" in r for r in results))
     
+    def test_search_products_scores_best_alias(self):
+        """Test that each product scores as its best name or alias"""
+        for query in ["banana", "huile", "pomme terre", "xyz"]:
+            cleaned = self.normalizer.clean_text(query)
+            for result in self.normalizer.search_products(query, limit=20):
+                names = [result["normalized_name"]] + result["aliases_fr"] + result["aliases_en"]
+                expected = max(
+                    self.normalizer.combined_similarity(cleaned, self.normalizer.clean_text(name))
+                    for name in names
+                )
+                self.assertEqual(result["match_score"], round(expected, 3))
+    
     def test_get_product_info(self):
         """Test getting product information"""
         info = self.normalizer.get_product_info("PROD_001")
@@ -357,6 +793,11 @@ class TestIntegration(unittest.TestCase):
         """Set up test fixtures"""
         self.normalizer = ProductNormalizer()
     
+    def test_shared_normalizer(self):
+        """Test that the module-level normalizer is created once and shared"""
+        self.assertIs(get_product_normalizer(), product_normalizer)
+        self.assertIs(get_product_normalizer(), get_product_normalizer())
+    
     def test_real_world_scenario_1(self):
         """Test real-world scenario: Multiple shops, different names"""
         # Shop 1 uses "BNN PLTN"
@@ -6,8 +6,6 @@ Handles French/English translation for product matching
 import logging
 from typing import Dict, Optional
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -190,10 +188,14 @@ class Translator:
     - Or a lightweight ML model like MarianMT
     """
     
+    # Bumped by add_translation, so caches of translated results can tell
+    # the tables changed. Class-wide, as all instances share the tables.
+    tables_version = 0
+    
     def __init__(self):
         self.fr_to_en = FRENCH_TO_ENGLISH
         self.en_to_fr = ENGLISH_TO_FRENCH
-        logger.info(f"Translator initialized with {len(self.fr_to_en)} French-English mappings")
+        logger.info("Translator initialized with %d French-English mappings", len(self.fr_to_en))
     
     def translate_to_english(self, text: str) -> str:
         """
@@ -352,7 +354,8 @@ class Translator:
         """
         self.fr_to_en[french.lower()] = english.lower()
         self.en_to_fr[english.lower()] = french.lower()
-        logger.info(f"Added translation: {french} <-> {english}")
+        Translator.tables_version += 1
+        logger.info("Added translation: %s <-> %s", french, english)
     
     def get_all_variants(self, text: str) -> list[str]:
         """
@@ -410,6 +413,8 @@ def detect_language(text: str) -> str:
 # ============================================================================
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     print("=" * 80)
     print("Translation Module Test")
     print("=" * 80)